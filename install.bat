@@ -39,7 +39,7 @@ if not exist "%INSTALL_DIR%\reminders.json" (
 
 :: Install dependencies
 echo [4/5] Installing Python dependencies...
-pip install -q winotify pygame pillow
+pip install -q winotify pygame pillow orjson
 if errorlevel 1 (
     echo WARNING: Some dependencies may not have installed correctly.
 )
@@ -56,7 +56,8 @@ for /f "delims=" %%i in ('where python') do (
 :: Replace python.exe with pythonw.exe for silent execution
 set "PYTHONW_PATH=!PYTHON_PATH:python.exe=pythonw.exe!"
 
-:: Delete existing task
+:: Stop and delete existing task
+schtasks /end /tn "XingchenReminder" >nul 2>&1
 schtasks /delete /tn "XingchenReminder" /f >nul 2>&1
 
 :: Create task XML
@@ -66,23 +67,22 @@ echo   ^<RegistrationInfo^> >> "%INSTALL_DIR%\task.xml"
 echo     ^<Description^>Xingchen Reminder - Background checker^</Description^> >> "%INSTALL_DIR%\task.xml"
 echo   ^</RegistrationInfo^> >> "%INSTALL_DIR%\task.xml"
 echo   ^<Triggers^> >> "%INSTALL_DIR%\task.xml"
-echo     ^<TimeTrigger^> >> "%INSTALL_DIR%\task.xml"
-echo       ^<Repetition^>^<Interval^>PT1M^</Interval^>^<StopAtDurationEnd^>false^</StopAtDurationEnd^>^</Repetition^> >> "%INSTALL_DIR%\task.xml"
-echo       ^<StartBoundary^>2025-01-01T00:00:00^</StartBoundary^> >> "%INSTALL_DIR%\task.xml"
+echo     ^<LogonTrigger^> >> "%INSTALL_DIR%\task.xml"
+echo       ^<UserId^>%USERDOMAIN%\%USERNAME%^</UserId^> >> "%INSTALL_DIR%\task.xml"
 echo       ^<Enabled^>true^</Enabled^> >> "%INSTALL_DIR%\task.xml"
-echo     ^</TimeTrigger^> >> "%INSTALL_DIR%\task.xml"
+echo     ^</LogonTrigger^> >> "%INSTALL_DIR%\task.xml"
 echo   ^</Triggers^> >> "%INSTALL_DIR%\task.xml"
 echo   ^<Settings^> >> "%INSTALL_DIR%\task.xml"
 echo     ^<MultipleInstancesPolicy^>IgnoreNew^</MultipleInstancesPolicy^> >> "%INSTALL_DIR%\task.xml"
 echo     ^<DisallowStartIfOnBatteries^>false^</DisallowStartIfOnBatteries^> >> "%INSTALL_DIR%\task.xml"
 echo     ^<StopIfGoingOnBatteries^>false^</StopIfGoingOnBatteries^> >> "%INSTALL_DIR%\task.xml"
-echo     ^<ExecutionTimeLimit^>PT30S^</ExecutionTimeLimit^> >> "%INSTALL_DIR%\task.xml"
+echo     ^<ExecutionTimeLimit^>PT0S^</ExecutionTimeLimit^> >> "%INSTALL_DIR%\task.xml"
 echo     ^<Hidden^>true^</Hidden^> >> "%INSTALL_DIR%\task.xml"
 echo   ^</Settings^> >> "%INSTALL_DIR%\task.xml"
 echo   ^<Actions^> >> "%INSTALL_DIR%\task.xml"
 echo     ^<Exec^> >> "%INSTALL_DIR%\task.xml"
 echo       ^<Command^>!PYTHONW_PATH!^</Command^> >> "%INSTALL_DIR%\task.xml"
-echo       ^<Arguments^>"%INSTALL_DIR%\reminder_checker.py"^</Arguments^> >> "%INSTALL_DIR%\task.xml"
+echo       ^<Arguments^>"%INSTALL_DIR%\reminder_checker.py" --daemon^</Arguments^> >> "%INSTALL_DIR%\task.xml"
 echo       ^<WorkingDirectory^>%INSTALL_DIR%^</WorkingDirectory^> >> "%INSTALL_DIR%\task.xml"
 echo     ^</Exec^> >> "%INSTALL_DIR%\task.xml"
 echo   ^</Actions^> >> "%INSTALL_DIR%\task.xml"
@@ -92,6 +92,7 @@ schtasks /create /tn "XingchenReminder" /xml "%INSTALL_DIR%\task.xml" >nul 2>&1
 if errorlevel 1 (
     echo WARNING: Could not create scheduled task. You may need to run as Administrator.
 ) else (
+    schtasks /run /tn "XingchenReminder" >nul 2>&1
     echo       Background service installed!
 )
 
@@ -122,6 +123,6 @@ echo Desktop shortcut created: Xingchen Reminder
 echo.
 echo You can now:
 echo   1. Double-click the desktop shortcut to open the GUI
-echo   2. The background service will check reminders every minute
+echo   2. The background service runs from logon and checks reminders as they come due
 echo.
 pause
@@ -58,13 +58,14 @@ function Install-App {
 
     # Install dependencies
     Write-Host "[4/5] Installing dependencies..." -ForegroundColor Yellow
-    pip install -q winotify pygame pillow
+    pip install -q winotify pygame pillow orjson
     Write-Host "       Dependencies installed" -ForegroundColor Green
 
     # Create scheduled task
     Write-Host "[5/5] Setting up background service..." -ForegroundColor Yellow
 
     # Remove existing task
+    schtasks /end /tn $TaskName 2>$null | Out-Null
     schtasks /delete /tn $TaskName /f 2>$null | Out-Null
 
     # Create task
@@ -75,14 +76,10 @@ function Install-App {
     <Description>Xingchen Reminder Background Checker</Description>
   </RegistrationInfo>
   <Triggers>
-    <TimeTrigger>
-      <Repetition>
-        <Interval>PT1M</Interval>
-        <StopAtDurationEnd>false</StopAtDurationEnd>
-      </Repetition>
-      <StartBoundary>2025-01-01T00:00:00</StartBoundary>
+    <LogonTrigger>
+      <UserId>$env:USERDOMAIN\$env:USERNAME</UserId>
       <Enabled>true</Enabled>
-    </TimeTrigger>
+    </LogonTrigger>
   </Triggers>
   <Principals>
     <Principal>
@@ -94,13 +91,13 @@ function Install-App {
     <MultipleInstancesPolicy>IgnoreNew</MultipleInstancesPolicy>
     <DisallowStartIfOnBatteries>false</DisallowStartIfOnBatteries>
     <StopIfGoingOnBatteries>false</StopIfGoingOnBatteries>
-    <ExecutionTimeLimit>PT30S</ExecutionTimeLimit>
+    <ExecutionTimeLimit>PT0S</ExecutionTimeLimit>
     <Hidden>true</Hidden>
   </Settings>
   <Actions>
     <Exec>
       <Command>$pythonwPath</Command>
-      <Arguments>"$InstallDir\reminder_checker.py"</Arguments>
+      <Arguments>"$InstallDir\reminder_checker.py" --daemon</Arguments>
       <WorkingDirectory>$InstallDir</WorkingDirectory>
     </Exec>
   </Actions>
@@ -111,6 +108,8 @@ function Install-App {
     schtasks /create /tn $TaskName /xml "$InstallDir\task.xml" 2>$null | Out-Null
 
     if ($LASTEXITCODE -eq 0) {
+        # Start the checker now instead of waiting for the next logon
+        schtasks /run /tn $TaskName 2>$null | Out-Null
         Write-Host "       Background service installed" -ForegroundColor Green
     } else {
         Write-Host "       Warning: Could not create scheduled task (may need admin rights)" -ForegroundColor Yellow
@@ -146,7 +145,8 @@ function Uninstall-App {
     Write-Header
     Write-Host "Uninstalling $AppName..." -ForegroundColor Yellow
 
-    # Remove scheduled task
+    # Stop and remove scheduled task
+    schtasks /end /tn $TaskName 2>$null | Out-Null
     schtasks /delete /tn $TaskName /f 2>$null | Out-Null
     Write-Host "  - Removed scheduled task" -ForegroundColor Green
 
@@ -7,12 +7,14 @@ Created by: Xingchen (for Lanniny)
 
 import os
 import sys
+import hashlib
 import ctypes
 import winsound
 import threading
+import queue
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 # For toast notifications
 TOAST_AVAILABLE = False
@@ -32,44 +34,217 @@ except ImportError:
         TOAST_LIB = None
 
 # For music playback (mp3, etc.)
+# The mixer is initialized lazily on first playback: an idle mixer keeps an
+# audio thread spinning, and most processes (e.g. the checker) never need it.
 PYGAME_AVAILABLE = False
 try:
     import pygame
-    pygame.mixer.init()
     PYGAME_AVAILABLE = True
 except ImportError:
     pass
 
+_pygame_inited = False
+_pygame_lock = threading.Lock()
+
+# Toasts are shown one at a time by a single worker thread
+_toast_queue = queue.Queue()
+_toast_thread = None
+_toast_lock = threading.Lock()
+
+# Popups run on their own threads so MessageBoxW does not block the caller
+_popup_threads = []
+
+# Recently played WAV files, kept in memory for SND_MEMORY playback
+_WAV_CACHE_MAX_ENTRIES = 8
+_WAV_CACHE_MAX_BYTES = 4 * 1024 * 1024  # Larger files are played from disk
+_wav_cache = {}  # path -> (mtime_ns, bytes)
+
+# Lower-case extension per sound file path (the same paths fire repeatedly)
+_path_meta_cache = {}
+
 # Paths
 SKILL_DIR = Path(__file__).parent
 SOUNDS_DIR = SKILL_DIR / "sounds"
 SOUNDS_DIR.mkdir(exist_ok=True)
 
 
+def cache_sound_file(file_path: str) -> str:
+    """
+    Copy a sound file into SOUNDS_DIR under a content-hash name.
+
+    Lets reminders play from a local copy even if the original is on a slow
+    drive or is moved later. Identical files share one copy.
+
+    Returns:
+        Path of the cached copy, or the original path if it cannot be cached
+    """
+    if not file_path:
+        return file_path
+    source = Path(file_path)
+    try:
+        if source.parent.resolve() == SOUNDS_DIR.resolve():
+            return file_path
+        data = source.read_bytes()
+        digest = hashlib.sha1(data).hexdigest()[:16]
+        target = SOUNDS_DIR / f"{digest}{source.suffix.lower()}"
+        if not target.exists():
+            target.write_bytes(data)
+        return str(target)
+    except OSError as e:
+        print(f"Could not cache sound file: {e}")
+        return file_path
+
+
+def release_sound_file(file_path: str, in_use) -> bool:
+    """
+    Delete a copy made by cache_sound_file() once no reminder uses it.
+
+    Args:
+        file_path: Sound file of a deleted reminder
+        in_use: Sound file paths of the remaining reminders
+
+    Returns:
+        True if a cached copy was deleted
+    """
+    if not file_path or file_path in in_use:
+        return False
+    path = Path(file_path)
+    try:
+        # Only copies in SOUNDS_DIR are ours to delete
+        if path.parent.resolve() != SOUNDS_DIR.resolve():
+            return False
+        path.unlink()
+    except OSError:
+        return False
+    _wav_cache.pop(file_path, None)
+    _path_meta_cache.pop(file_path, None)
+    return True
+
+
+def _ensure_pygame() -> bool:
+    """Initialize pygame.mixer on first use. Returns True if the mixer is ready."""
+    global _pygame_inited
+    if not PYGAME_AVAILABLE:
+        return False
+    if _pygame_inited:
+        return True
+    with _pygame_lock:
+        if not _pygame_inited:
+            try:
+                # A larger buffer avoids dropouts and cuts audio-thread
+                # wakeups; latency does not matter for reminder sounds.
+                pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=4096)
+                pygame.mixer.init()
+                _pygame_inited = True
+            except Exception as e:
+                print(f"Pygame mixer init failed: {e}")
+        return _pygame_inited
+
+
+def _show_winotify(title: str, message: str, duration: int) -> None:
+    """Show a toast with winotify on the calling thread."""
+    toast = Notification(
+        app_id="Xingchen Reminder",
+        title=title,
+        msg=message,
+        duration="short"
+    )
+    toast.show()
+
+
+def _show_win10toast(title: str, message: str, duration: int) -> None:
+    """Show a toast with win10toast on the calling thread."""
+    # Blocks for `duration`, so the next toast is not dropped
+    toast_notifier.show_toast(title, message, duration=duration, threaded=False)
+
+
+def _toast_worker():
+    """Drain the toast queue sequentially."""
+    while True:
+        title, message, duration = _toast_queue.get()
+        try:
+            _show_toast_now(title, message, duration)
+        except Exception as e:
+            print(f"Toast notification failed: {e}")
+        finally:
+            _toast_queue.task_done()
+
+
+def _start_toast_worker():
+    """Start the toast worker thread if it is not running yet."""
+    global _toast_thread
+    if _toast_thread is not None:
+        return
+    with _toast_lock:
+        if _toast_thread is None:
+            _toast_thread = threading.Thread(target=_toast_worker, daemon=True)
+            _toast_thread.start()
+
+
+def _queue_toast(title: str, message: str, duration: int) -> bool:
+    """Hand a toast to the worker thread."""
+    _start_toast_worker()
+    _toast_queue.put((title, message, duration))
+    return True
+
+
+def _print_toast(title: str, message: str, duration: int) -> bool:
+    """Fallback when no toast library is installed."""
+    print(f"\n[REMINDER] {title}: {message}")
+    return False
+
+
+# TOAST_LIB is fixed at import, so pick the toast functions once
+if TOAST_LIB == "winotify":
+    _show_toast_now = _show_winotify
+    _show_toast_impl = _queue_toast
+elif TOAST_LIB == "win10toast":
+    _show_toast_now = _show_win10toast
+    _show_toast_impl = _queue_toast
+else:
+    _show_toast_now = None
+    _show_toast_impl = _print_toast
+
+
 def show_toast(title: str, message: str, duration: int = 5) -> bool:
     """Show a Windows toast notification."""
-    if not TOAST_AVAILABLE:
-        print(f"\n[REMINDER] {title}: {message}")
-        return False
+    return _show_toast_impl(title, message, duration)
+
+
+def wait_for_notifications() -> None:
+    """Block until queued toasts are shown and open popups are closed (call before exiting)."""
+    if _toast_thread is not None:
+        _toast_queue.join()
+    for thread in list(_popup_threads):
+        thread.join()
 
+
+def _path_meta(file_path: str) -> Tuple[Optional[os.stat_result], str]:
+    """Return the file's stat result (None if missing) and its lower-case extension."""
+    ext = _path_meta_cache.get(file_path)
+    if ext is None:
+        ext = _path_meta_cache[file_path] = os.path.splitext(file_path)[1].lower()
     try:
-        if TOAST_LIB == "winotify":
-            toast = Notification(
-                app_id="Xingchen Reminder",
-                title=title,
-                msg=message,
-                duration="short"
-            )
-            toast.show()
-            return True
-        elif TOAST_LIB == "win10toast":
-            def show():
-                toast_notifier.show_toast(title, message, duration=duration, threaded=True)
-            threading.Thread(target=show, daemon=True).start()
-            return True
-    except Exception as e:
-        print(f"Toast notification failed: {e}")
-        return False
+        st = os.stat(file_path)
+    except OSError:
+        st = None
+    return st, ext
+
+
+def _load_wav(file_path: str, st: os.stat_result) -> Optional[bytes]:
+    """Return the WAV file's bytes from the cache, re-reading it if it changed."""
+    cached = _wav_cache.pop(file_path, None)
+    if cached is not None and cached[0] == st.st_mtime_ns:
+        data = cached[1]
+    else:
+        if st.st_size > _WAV_CACHE_MAX_BYTES:
+            return None
+        data = Path(file_path).read_bytes()
+        if len(_wav_cache) >= _WAV_CACHE_MAX_ENTRIES:
+            # Evict the least recently played file
+            del _wav_cache[next(iter(_wav_cache))]
+    _wav_cache[file_path] = (st.st_mtime_ns, data)
+    return data
 
 
 def show_popup(title: str, message: str, icon: str = "info") -> int:
@@ -85,6 +260,22 @@ def show_popup(title: str, message: str, icon: str = "info") -> int:
     return result
 
 
+def show_popup_async(title: str, message: str, icon: str = "info") -> threading.Thread:
+    """Show a popup on a background thread and return immediately."""
+    _popup_threads[:] = [t for t in _popup_threads if t.is_alive()]
+    thread = threading.Thread(target=show_popup, args=(title, message, icon), daemon=True)
+    thread.start()
+    _popup_threads.append(thread)
+    return thread
+
+
+def _alarm_seq():
+    """Play the three-beep alarm sequence (blocks for about a second)."""
+    for _ in range(3):
+        winsound.MessageBeep(winsound.MB_ICONHAND)
+        time.sleep(0.3)
+
+
 def play_sound(sound_type: str = "default", duration: float = 0) -> bool:
     """
     Play a notification sound.
@@ -102,12 +293,8 @@ def play_sound(sound_type: str = "default", duration: float = 0) -> bool:
         elif sound_type == "important":
             winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
         elif sound_type == "alarm":
-            for _ in range(3):
-                winsound.MessageBeep(winsound.MB_ICONHAND)
-                time.sleep(0.3)
-        elif os.path.exists(sound_type):
-            play_music_file(sound_type, duration)
-        else:
+            threading.Thread(target=_alarm_seq, daemon=True).start()
+        elif not play_music_file(sound_type, duration):
             winsound.MessageBeep()
         return True
     except Exception as e:
@@ -125,26 +312,39 @@ def play_music_file(file_path: str, duration: float = 0, block: bool = False) ->
         block: Whether to block until playback finishes
 
     Returns:
-        True if playback started successfully
+        True if playback started successfully (False if the file is missing)
     """
     file_path = str(file_path)
 
-    # Check file extension
-    ext = os.path.splitext(file_path)[1].lower()
+    # One stat per call: existence here, mtime for the WAV cache
+    st, ext = _path_meta(file_path)
+    if st is None:
+        return False
 
     # For WAV files, can use winsound
     if ext == ".wav" and duration == 0:
         try:
-            if block:
-                winsound.PlaySound(file_path, winsound.SND_FILENAME)
+            data = _load_wav(file_path, st)
+            if data is None:
+                if block:
+                    winsound.PlaySound(file_path, winsound.SND_FILENAME)
+                else:
+                    winsound.PlaySound(file_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            elif block:
+                winsound.PlaySound(data, winsound.SND_MEMORY)
             else:
-                winsound.PlaySound(file_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+                # winsound cannot combine SND_MEMORY with SND_ASYNC
+                threading.Thread(
+                    target=winsound.PlaySound,
+                    args=(data, winsound.SND_MEMORY),
+                    daemon=True
+                ).start()
             return True
         except:
             pass
 
     # For other formats or duration control, use pygame
-    if PYGAME_AVAILABLE:
+    if _ensure_pygame():
         try:
             def play_thread():
                 pygame.mixer.music.load(file_path)
@@ -154,8 +354,7 @@ def play_music_file(file_path: str, duration: float = 0, block: bool = False) ->
                     time.sleep(duration)
                     pygame.mixer.music.stop()
                 elif block:
-                    while pygame.mixer.music.get_busy():
-                        time.sleep(0.1)
+                    _wait_for_music_end()
 
             if block:
                 play_thread()
@@ -177,9 +376,16 @@ def play_music_file(file_path: str, duration: float = 0, block: bool = False) ->
     return False
 
 
+def _wait_for_music_end():
+    """Block until pygame music playback finishes."""
+    # Only the mixer is initialized, so there is no event queue to wait on
+    while pygame.mixer.music.get_busy():
+        time.sleep(0.5)
+
+
 def stop_music():
     """Stop currently playing music."""
-    if PYGAME_AVAILABLE:
+    if _pygame_inited:
         try:
             pygame.mixer.music.stop()
         except:
@@ -206,20 +412,17 @@ def notify(
         sound_duration: Sound duration in seconds (0 = full length)
     """
     if priority == "important":
-        # Important: Play sound first, then popup (popup blocks)
+        # Important: Sound and popup together (popup runs on its own thread)
         if sound:
-            if sound_file and os.path.exists(sound_file):
-                play_music_file(sound_file, sound_duration)
-            else:
+            # Fall back to the system sound if the custom file is missing
+            if not (sound_file and play_music_file(sound_file, sound_duration)):
                 play_sound("important")
-        show_popup(f"[!] {title}", message, icon="warning")
+        show_popup_async(f"[!] {title}", message, icon="warning")
     else:
         # Normal: Toast notification
         show_toast(title, message)
         if sound:
-            if sound_file and os.path.exists(sound_file):
-                play_music_file(sound_file, sound_duration)
-            else:
+            if not (sound_file and play_music_file(sound_file, sound_duration)):
                 play_sound("default")
 
 
@@ -237,16 +440,15 @@ def notify_reminder(reminder: dict) -> None:
     sound_file = reminder.get("sound_file", "")
     sound_duration = reminder.get("sound_duration", 0)
 
+    # Time prefix: the HH:MM part of "YYYY-MM-DD HH:MM"
+    trigger_time = reminder.get("trigger_time", "")
+    prefix = f"[{trigger_time[trigger_time.rfind(' ') + 1:]}] " if trigger_time else ""
+
     # Build message
-    message = title
     if description:
-        message += f"\n\n{description}"
-
-    # Add time info
-    trigger_time = reminder.get("trigger_time", "")
-    if trigger_time:
-        time_part = trigger_time.split(" ")[-1] if " " in trigger_time else trigger_time
-        message = f"[{time_part}] {message}"
+        message = f"{prefix}{title}\n\n{description}"
+    else:
+        message = f"{prefix}{title}"
 
     notify(f"Xingchen Reminder", message, priority, sound, sound_file, sound_duration)
 
@@ -269,6 +471,7 @@ if __name__ == "__main__":
     if args.all or args.toast:
         print("Testing toast notification...")
         show_toast("Test Reminder", "This is a test toast notification from Xingchen!")
+        wait_for_notifications()
 
     if args.all or args.sound:
         print("Testing sound...")
@@ -288,6 +491,7 @@ if __name__ == "__main__":
     if args.important:
         print("Testing important notification...")
         notify("IMPORTANT TEST", "This is an important reminder test!", priority="important")
+        wait_for_notifications()
 
     if not any([args.toast, args.popup, args.sound, args.all, args.important, args.music]):
         print("Notification module loaded successfully!")
@@ -1,20 +1,28 @@
 """
 Reminder Checker - Background Service Script
 ---------------------------------------------
-This script is called by Windows Task Scheduler to check for due reminders.
+This script checks for due reminders. It is started by Windows Task
+Scheduler at logon with --daemon and stays running; without arguments
+it runs a single check and exits.
 Created by: Xingchen (for Lanniny)
 """
 
 import sys
 import os
+import json
+import time
+import asyncio
 from pathlib import Path
 
 # Add skill directory to path
 SKILL_DIR = Path(__file__).parent
 sys.path.insert(0, str(SKILL_DIR))
 
-from reminder_manager import get_due_reminders, mark_triggered
-from notification import notify_reminder
+from reminder_manager import (
+    get_due_reminders, mark_triggered_many, update_next_trigger_cache,
+    DATA_FILE, NEXT_TRIGGER_FILE, LOG_FILE as OPS_LOG_FILE
+)
+from notification import notify_reminder, wait_for_notifications
 
 import logging
 from datetime import datetime
@@ -33,43 +41,118 @@ def setup_logging():
     )
 
 
+def read_next_trigger():
+    """
+    Read the next-trigger sidecar file without opening the reminder store.
+
+    Returns:
+        (valid, next_trigger) - valid is False if a full check is needed;
+        next_trigger is None when no enabled reminder is upcoming
+    """
+    try:
+        cache_mtime = NEXT_TRIGGER_FILE.stat().st_mtime
+        # Store edited outside reminder_manager since the sidecar was written
+        for path in (DATA_FILE, OPS_LOG_FILE):
+            if path.exists() and path.stat().st_mtime > cache_mtime:
+                return False, None
+        with open(NEXT_TRIGGER_FILE, "r", encoding="utf-8") as f:
+            next_trigger = json.load(f)["next_trigger"]
+        if next_trigger is None:
+            return True, None
+        return True, datetime.fromisoformat(next_trigger)
+    except (OSError, ValueError, KeyError, TypeError):
+        return False, None
+
+
+def nothing_due() -> bool:
+    """Return True if the sidecar file says no reminder can be due yet."""
+    valid, next_trigger = read_next_trigger()
+    if not valid:
+        return False
+    return next_trigger is None or datetime.now() < next_trigger
+
+
 def check_and_notify():
     """Check for due reminders and send notifications."""
     try:
-        due_reminders = get_due_reminders()
+        if nothing_due():
+            return 0
+
+        now_ts = int(time.time())
+        due_reminders = get_due_reminders(now_ts)
 
         if not due_reminders:
+            update_next_trigger_cache()
             return 0
 
-        count = 0
+        triggered_ids = []
         for reminder in due_reminders:
             try:
                 # Send notification
                 notify_reminder(reminder)
-
-                # Mark as triggered (updates next trigger time for repeating reminders)
-                mark_triggered(reminder["id"])
+                triggered_ids.append(reminder["id"])
 
                 logging.info(f"Triggered reminder: {reminder['id']} - {reminder['title']}")
-                count += 1
 
             except Exception as e:
                 logging.error(f"Failed to trigger reminder {reminder['id']}: {e}")
 
-        return count
+        # Mark all as triggered in one write (updates next trigger time for repeating reminders)
+        mark_triggered_many(triggered_ids, now_ts)
+
+        return len(triggered_ids)
 
     except Exception as e:
         logging.error(f"Check failed: {e}")
         return -1
 
 
+def seconds_until_next_check(max_wait: float = 60) -> float:
+    """Seconds to sleep before the next check, capped so edits are picked up."""
+    valid, next_trigger = read_next_trigger()
+    if not valid or next_trigger is None:
+        return max_wait
+
+    now = datetime.now()
+    wait = (next_trigger - now).total_seconds()
+    if wait <= 0:
+        # Still due (e.g. notification failed): retry at the next minute
+        wait = 60 - now.second - now.microsecond / 1_000_000
+    return min(wait, max_wait)
+
+
+async def run_forever():
+    """Check reminders in a loop, sleeping until the next trigger time."""
+    loop = asyncio.get_running_loop()
+    while True:
+        # Run the blocking check off the event loop
+        result = await loop.run_in_executor(None, check_and_notify)
+        if result > 0:
+            logging.info(f"Triggered {result} reminder(s)")
+        elif result < 0:
+            logging.error("Check failed with error")
+
+        await asyncio.sleep(seconds_until_next_check())
+
+
 def main():
     """Main entry point."""
     setup_logging()
 
+    if "--daemon" in sys.argv:
+        logging.info("Reminder checker started in daemon mode")
+        try:
+            asyncio.run(run_forever())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
     # Run check
     result = check_and_notify()
 
+    # Toasts and popups run on daemon threads; let them finish before exiting
+    wait_for_notifications()
+
     if result > 0:
         logging.info(f"Triggered {result} reminder(s)")
     elif result == 0:
@@ -8,7 +8,9 @@ Created by: Xingchen (for Lanniny)
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, timedelta
+import re
 import sys
+import threading
 from pathlib import Path
 
 # Add skill directory to path
@@ -16,13 +18,54 @@ SKILL_DIR = Path(__file__).parent
 sys.path.insert(0, str(SKILL_DIR))
 
 from reminder_manager import (
-    add_reminder, list_reminders, delete_reminder, toggle_reminder,
+    add_reminder, list_reminders, get_reminder, delete_reminder, toggle_reminder,
     REPEAT_NONE, REPEAT_DAILY, REPEAT_WEEKLY, REPEAT_WEEKDAYS
 )
-from notification import play_music_file, stop_music, PYGAME_AVAILABLE
+from notification import (
+    play_music_file, stop_music, cache_sound_file, release_sound_file, PYGAME_AVAILABLE
+)
+
+# Input formats accepted by the add dialog
+_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")
+
+
+def _valid_date(date_str):
+    """Check a YYYY-MM-DD date string."""
+    m = _DATE_RE.fullmatch(date_str)
+    if not m:
+        return False
+    try:
+        # Catches day-of-month overflow such as 2025-02-30
+        datetime(*map(int, m.groups()))
+    except ValueError:
+        return False
+    return True
+
+
+def _valid_time(time_str):
+    """Check an HH:MM (24-hour) time string."""
+    m = _TIME_RE.fullmatch(time_str)
+    return bool(m) and int(m.group(1)) < 24 and int(m.group(2)) < 60
 
 
 class ReminderApp:
+    # Display values for the reminder list
+    _REPEAT_NAMES = {
+        "none": "-",
+        "daily": "Daily",
+        "weekly": "Weekly",
+        "weekdays": "Weekdays"
+    }
+    _STATUS_ON = "ON"
+    _STATUS_OFF = "OFF"
+
+    # Lists longer than this only insert the rows in view
+    _VIRTUAL_THRESHOLD = 100
+    _ROW_HEIGHT = 30
+    # Mouse wheel: rows scrolled per notch (120 units of event.delta)
+    _WHEEL_ROWS = 3
+
     def __init__(self, root):
         self.root = root
         self.root.title("Xingchen Reminder")
@@ -38,6 +81,19 @@ class ReminderApp:
 
         self.root.configure(bg=self.bg_color)
 
+        # Incremented per refresh so results of superseded loads are dropped
+        self._refresh_gen = 0
+
+        # Row data for the list; in virtual mode only a window of it is inserted
+        self._rows = []
+        self._row_pos = {}  # reminder id -> index in _rows
+        self._virtual = False
+        self._top = 0
+        self._visible_rows = 12
+        self._wheel_delta = 0  # Wheel units not yet scrolled (touchpads send small deltas)
+        # Tracked here since in virtual mode its row may not be in the tree
+        self._selected_id = None
+
         # Configure styles
         self.setup_styles()
 
@@ -59,7 +115,7 @@ class ReminderApp:
             background=self.secondary_color,
             foreground=self.fg_color,
             fieldbackground=self.secondary_color,
-            rowheight=30
+            rowheight=self._ROW_HEIGHT
         )
         style.configure("Treeview.Heading",
             background=self.accent_color,
@@ -102,7 +158,8 @@ class ReminderApp:
         # Columns
         columns = ("status", "time", "title", "repeat", "sound")
 
-        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=12)
+        self.tree = ttk.Treeview(list_frame, columns=columns, show="headings",
+            height=self._visible_rows)
 
         # Column headings
         self.tree.heading("status", text="Status")
@@ -118,12 +175,20 @@ class ReminderApp:
         self.tree.column("repeat", width=100, anchor="center")
         self.tree.column("sound", width=100, anchor="center")
 
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar (routed through _yview for virtual mode)
+        self.scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self._yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
 
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind("<Configure>", self._on_tree_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._visible_rows))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._visible_rows))
 
         # Double-click to edit
         self.tree.bind("<Double-1>", self.on_double_click)
@@ -187,42 +252,159 @@ class ReminderApp:
         refresh_btn.pack(side=tk.RIGHT)
 
     def refresh_list(self):
-        """Refresh the reminder list."""
-        # Clear current items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """Refresh the reminder list (loads from disk on a worker thread)."""
+        self._refresh_gen += 1
 
-        # Load reminders
-        reminders = list_reminders(include_disabled=True)
+        # Clear current items (single Tcl call) and show a placeholder
+        self.tree.delete(*self.tree.get_children())
+        self.tree.insert("", tk.END, values=("", "", "Loading...", "", ""))
 
-        repeat_names = {
-            "none": "-",
-            "daily": "Daily",
-            "weekly": "Weekly",
-            "weekdays": "Weekdays"
-        }
+        threading.Thread(
+            target=self._load_reminders_worker,
+            args=(self._refresh_gen,),
+            daemon=True
+        ).start()
+
+    def _load_reminders_worker(self, gen):
+        """Load reminders off the Tk thread and hand them back to it."""
+        try:
+            reminders = list_reminders(include_disabled=True)
+        except Exception as e:
+            self.root.after(0, messagebox.showerror, "Error", f"Failed to load reminders: {e}")
+            return
+        self.root.after(0, self._populate_tree, reminders, gen)
 
+    def _populate_tree(self, reminders, gen):
+        """Fill the list with loaded reminders (runs on the Tk thread)."""
+        if gen != self._refresh_gen:
+            return
+
+        # Local references for the loop
+        get_repeat = self._REPEAT_NAMES.get
+        status_on, status_off = self._STATUS_ON, self._STATUS_OFF
+
+        rows = []
+        append = rows.append
         for r in reminders:
-            status = "ON" if r.get("enabled", True) else "OFF"
+            status = status_on if r.get("enabled", True) else status_off
             time_str = r.get("trigger_time", "")
             title = r.get("title", "")
-            repeat = repeat_names.get(r.get("repeat", "none"), r.get("repeat", ""))
+            repeat = r.get("repeat", "none")
+            repeat = get_repeat(repeat, repeat)
 
             # Sound info
             sound_file = r.get("sound_file", "")
             if sound_file:
-                sound_name = Path(sound_file).name[:15] + "..." if len(Path(sound_file).name) > 15 else Path(sound_file).name
+                name = Path(sound_file).name
+                sound_name = f"{name[:15]}..." if len(name) > 15 else name
             else:
                 sound_name = "System"
 
-            # Insert with id as tag
-            self.tree.insert("", tk.END,
-                values=(status, time_str, title, repeat, sound_name),
-                tags=(r["id"],)
-            )
+            # Row values plus id tag
+            append(((status, time_str, title, repeat, sound_name), r["id"]))
+
+        self._rows = rows
+        self._row_pos = {tag: i for i, (_, tag) in enumerate(rows)}
+        self._virtual = len(rows) > self._VIRTUAL_THRESHOLD
+        if self._selected_id not in self._row_pos:
+            self._selected_id = None
+
+        if self._virtual:
+            # The scrollbar tracks the row window, not the tree's own items
+            self.tree.configure(yscrollcommand="")
+            self._render_window()
+        else:
+            self.tree.configure(yscrollcommand=self.scrollbar.set)
+            self.tree.delete(*self.tree.get_children())
+            insert = self.tree.insert
+            for values, tag in rows:
+                insert("", tk.END, values=values, tags=(tag,))
+
+    def _render_window(self):
+        """Insert only the rows currently in view (virtual mode)."""
+        total = len(self._rows)
+        count = self._visible_rows
+        self._top = max(0, min(self._top, total - count))
+
+        # Re-select the selected reminder when its row is in view
+        selected = self._selected_id
+
+        tree = self.tree
+        tree.delete(*tree.get_children())
+        insert = tree.insert
+        for values, tag in self._rows[self._top:self._top + count]:
+            item = insert("", tk.END, values=values, tags=(tag,))
+            if tag == selected:
+                tree.selection_set(item)
+
+        if total:
+            self.scrollbar.set(self._top / total, min(self._top + count, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _yview(self, *args):
+        """Scrollbar command: scroll the tree, or move the row window in virtual mode."""
+        if not self._virtual:
+            return self.tree.yview(*args)
+
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * len(self._rows))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._visible_rows
+            self._top += step
+        self._render_window()
+
+    def _on_mousewheel(self, event):
+        """Scroll the row window with the mouse wheel (virtual mode)."""
+        if not self._virtual:
+            return None
+        # Accumulate so small deltas add up, the same way in both directions
+        self._wheel_delta += event.delta
+        notches = int(self._wheel_delta / 120)
+        if notches:
+            self._wheel_delta -= notches * 120
+            self._top -= notches * self._WHEEL_ROWS
+            self._render_window()
+        return "break"
+
+    def _on_select(self, event):
+        """Remember the selected reminder by id."""
+        selection = self.tree.selection()
+        # Re-rendering the window deselects rows that left the view; keep the id
+        if selection:
+            tags = self.tree.item(selection[0], "tags")
+            self._selected_id = tags[0] if tags else None
+        elif not self._virtual:
+            self._selected_id = None
+
+    def _move_selection(self, step):
+        """Move the selection by step rows, scrolling the window (virtual mode)."""
+        if not self._virtual or not self._rows:
+            return None
+        pos = self._row_pos.get(self._selected_id)
+        i = self._top if pos is None else max(0, min(pos + step, len(self._rows) - 1))
+        self._selected_id = self._rows[i][1]
+        if i < self._top:
+            self._top = i
+        elif i >= self._top + self._visible_rows:
+            self._top = i - self._visible_rows + 1
+        self._render_window()
+        return "break"
+
+    def _on_tree_resize(self, event):
+        """Recompute how many rows fit when the list is resized."""
+        rows = max(1, event.height // self._ROW_HEIGHT)
+        if rows != self._visible_rows:
+            self._visible_rows = rows
+            if self._virtual:
+                self._render_window()
 
     def get_selected_id(self):
         """Get the ID of the selected reminder."""
+        if self._virtual:
+            return self._selected_id
         selection = self.tree.selection()
         if not selection:
             return None
@@ -238,9 +420,21 @@ class ReminderApp:
             return
 
         if messagebox.askyesno("Confirm", "Delete this reminder?"):
+            reminder = get_reminder(reminder_id)
             delete_reminder(reminder_id)
+            if reminder and reminder.get("sound_file"):
+                threading.Thread(
+                    target=self._release_sound_worker,
+                    args=(reminder["sound_file"],),
+                    daemon=True
+                ).start()
             self.refresh_list()
 
+    def _release_sound_worker(self, sound_file):
+        """Delete a cached sound copy no other reminder uses (off the Tk thread)."""
+        in_use = {r.get("sound_file") for r in list_reminders(include_disabled=True)}
+        release_sound_file(sound_file, in_use)
+
     def toggle_selected(self):
         """Toggle the selected reminder."""
         reminder_id = self.get_selected_id()
@@ -392,10 +586,11 @@ class AddReminderDialog:
             command=self.window.destroy, cursor='hand2'
         ).pack(side=tk.RIGHT, padx=(10, 0))
 
-        tk.Button(btn_frame, text="Add", bg=self.app.success_color, fg="white",
+        self.add_btn = tk.Button(btn_frame, text="Add", bg=self.app.success_color, fg="white",
             font=('Segoe UI', 10, 'bold'), width=10, relief=tk.FLAT,
             command=self.add_reminder, cursor='hand2'
-        ).pack(side=tk.RIGHT)
+        )
+        self.add_btn.pack(side=tk.RIGHT)
 
     def browse_sound(self):
         """Browse for sound file."""
@@ -438,16 +633,12 @@ class AddReminderDialog:
         time_str = self.time_entry.get().strip()
 
         # Validate time format
-        try:
-            datetime.strptime(time_str, "%H:%M")
-        except ValueError:
+        if not _valid_time(time_str):
             messagebox.showerror("Error", "Invalid time format. Use HH:MM (24-hour).")
             return
 
         # Validate date format
-        try:
-            datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
+        if not _valid_date(date_str):
             messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD.")
             return
 
@@ -456,18 +647,44 @@ class AddReminderDialog:
         except ValueError:
             duration = 0
 
-        # Add reminder
-        add_reminder(
-            title=title,
-            time_str=time_str,
-            date_str=date_str,
-            priority=self.priority_var.get(),
-            repeat=self.repeat_var.get(),
-            sound_file=self.sound_file,
-            sound_duration=duration
-        )
-
-        self.window.destroy()
+        # Copying the sound file can be slow; save on a worker thread
+        self.add_btn.configure(state=tk.DISABLED, text="Saving...")
+        threading.Thread(
+            target=self._save_worker,
+            args=(title, time_str, date_str, self.priority_var.get(),
+                  self.repeat_var.get(), self.sound_file, duration),
+            daemon=True
+        ).start()
+
+    def _save_worker(self, title, time_str, date_str, priority, repeat, sound_file, duration):
+        """Cache the sound file and add the reminder off the Tk thread."""
+        try:
+            # Play from a local copy so firing does not touch the original file
+            sound_file = cache_sound_file(sound_file)
+            add_reminder(
+                title=title,
+                time_str=time_str,
+                date_str=date_str,
+                priority=priority,
+                repeat=repeat,
+                sound_file=sound_file,
+                sound_duration=duration
+            )
+        except Exception as e:
+            self.app.root.after(0, self._save_failed, e)
+            return
+        self.app.root.after(0, self._close)
+
+    def _save_failed(self, error):
+        """Report a failed save and let the user retry (runs on the Tk thread)."""
+        if self.window.winfo_exists():
+            self.add_btn.configure(state=tk.NORMAL, text="Add")
+        messagebox.showerror("Error", f"Failed to add reminder: {error}")
+
+    def _close(self):
+        """Close the dialog once the reminder is saved (runs on the Tk thread)."""
+        if self.window.winfo_exists():
+            self.window.destroy()
 
 
 def main():
@@ -5,16 +5,40 @@ Core module for managing reminders.
 Created by: Xingchen (for Lanniny)
 """
 
+import heapq
 import json
 import os
-import uuid
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Paths
 SKILL_DIR = Path(__file__).parent
 DATA_FILE = SKILL_DIR / "reminders.json"
+LOG_FILE = SKILL_DIR / "reminders.log"  # Mutations since the last checkpoint
+NEXT_TRIGGER_FILE = SKILL_DIR / "reminder_checker.next.json"
+
+# Checkpoint (rewrite DATA_FILE, clear LOG_FILE) once the log is this big
+LOG_MAX_BYTES = 256 * 1024
+LOG_MAX_OPS = 1000
+
+# On Windows, replacing reminders.json fails while another process has it
+# open; retry this many times, this many seconds apart
+REPLACE_ATTEMPTS = 5
+REPLACE_RETRY_DELAY = 0.05
+
+# A reminder counts as due for this long after its trigger time (seconds)
+DUE_WINDOW = 5 * 60
 
 # Repeat types
 REPEAT_NONE = "none"
@@ -23,21 +47,481 @@ REPEAT_WEEKLY = "weekly"
 REPEAT_WEEKDAYS = "weekdays"  # Mon-Fri
 REPEAT_CUSTOM = "custom"  # Custom interval in days
 
+# Stored time formats, and module-level bindings for the per-reminder paths
+_FMT_MIN = "%Y-%m-%d %H:%M"  # trigger_time
+_FMT_SEC = "%Y-%m-%d %H:%M:%S"  # created_at, last_triggered
+_strptime = datetime.strptime
+_now = datetime.now
+_td = timedelta
+
+# Days from each weekday (Mon=0 .. Sun=6) to the next Mon-Fri
+_WEEKDAY_SKIP = [1, 1, 1, 1, 3, 2, 1]
+
+
+def _to_ts(trigger_time: str) -> int:
+    """Convert a "YYYY-MM-DD HH:MM" local time string to unix seconds."""
+    return int(_strptime(trigger_time, _FMT_MIN).timestamp())
+
+
+def _format_ts(ts: int) -> str:
+    """Format unix seconds as a "YYYY-MM-DD HH:MM" local time string."""
+    return time.strftime(_FMT_MIN, time.localtime(ts))
+
+
+def _add_days(ts: int, days: int) -> int:
+    """Shift unix seconds by whole days, keeping the local clock time across DST changes."""
+    next_ts = ts + days * 86400
+    return next_ts + time.localtime(ts).tm_gmtoff - time.localtime(next_ts).tm_gmtoff
+
+
+def _migrate(data: Dict[str, Any]) -> None:
+    """Fill in or re-derive trigger_ts, and fill in last_triggered_ts, for loaded reminders."""
+    for r in data["reminders"]:
+        # trigger_time is what users see and may edit by hand; it wins
+        if "trigger_ts" not in r or _format_ts(r["trigger_ts"]) != r["trigger_time"]:
+            r["trigger_ts"] = _to_ts(r["trigger_time"])
+        if "last_triggered_ts" not in r:
+            last = r.get("last_triggered")
+            r["last_triggered_ts"] = (
+                int(_strptime(last, _FMT_SEC).timestamp()) if last else None
+            )
+
+
+def _default_data() -> Dict[str, Any]:
+    """Empty reminder data, used when no data file exists yet."""
+    return {"reminders": [], "settings": {"default_sound": True}, "last_check": None}
+
+
+def _parse_json(buf: bytes) -> Any:
+    """Parse JSON bytes with orjson when available."""
+    return orjson.loads(buf) if orjson else json.loads(buf.decode("utf-8"))
+
+
+def _dump_data(data: Dict[str, Any]) -> bytes:
+    """Serialize reminder data as indented UTF-8 JSON."""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _dump_op(op: Dict[str, Any], gen: Optional[str]) -> bytes:
+    """Serialize one operation, tagged with the checkpoint's log_gen, as a single JSON line."""
+    op = dict(op, gen=gen)
+    # Leading newline: an op never lands on a line torn by a crashed writer
+    if orjson:
+        return b"\n" + orjson.dumps(op)
+    return b"\n" + json.dumps(op, ensure_ascii=False).encode("utf-8")
+
+
+# id -> reminder index for the most recently used data dict
+_index_data = None
+_index = {}
+
+
+def _by_id(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Return the id index for data, building it when data is a new object."""
+    global _index_data, _index
+    if _index_data is not data:
+        _index = {r["id"]: r for r in data["reminders"]}
+        _index_data = data
+    return _index
+
+
+# Min-heap of (trigger_ts, id) for the most recently used data dict.
+# Entries go stale when a reminder changes; they are skipped when popped.
+_heap_data = None
+_heap = []
+
+
+def _trigger_heap(data: Dict[str, Any]) -> List[tuple]:
+    """Return the trigger heap for data, building it when data is a new object."""
+    global _heap_data, _heap
+    if _heap_data is not data:
+        _heap = [(r["trigger_ts"], r["id"]) for r in data["reminders"] if r.get("enabled", True)]
+        heapq.heapify(_heap)
+        _heap_data = data
+    return _heap
+
+
+def _schedule(data: Dict[str, Any], r: Dict[str, Any]) -> None:
+    """Push a reminder's current trigger time onto the heap if it is enabled."""
+    if _heap_data is data and r.get("enabled", True):
+        heapq.heappush(_heap, (r["trigger_ts"], r["id"]))
+
+
+def _heap_entry_live(data: Dict[str, Any], entry: tuple) -> Optional[Dict[str, Any]]:
+    """Return the reminder for a heap entry, or None if the entry is stale."""
+    r = _by_id(data).get(entry[1])
+    if r is None or not r.get("enabled", True) or r["trigger_ts"] != entry[0]:
+        return None
+    return r
+
+
+# data["reminders"] is kept sorted by trigger_ts (ties in insertion order)
+def _bisect_ts(reminders: List[Dict[str, Any]], ts: int, right: bool = False) -> int:
+    """Position of ts in a list of reminders sorted by trigger_ts."""
+    lo, hi = 0, len(reminders)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        mid_ts = reminders[mid]["trigger_ts"]
+        if mid_ts < ts or (right and mid_ts == ts):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _insert_sorted(data: Dict[str, Any], r: Dict[str, Any]) -> None:
+    """Insert a reminder at its trigger_ts position."""
+    reminders = data["reminders"]
+    reminders.insert(_bisect_ts(reminders, r["trigger_ts"], right=True), r)
+
+
+def _unlink_sorted(data: Dict[str, Any], r: Dict[str, Any]) -> None:
+    """Take a reminder out of the list, found by its current trigger_ts."""
+    reminders = data["reminders"]
+    i = _bisect_ts(reminders, r["trigger_ts"])
+    while reminders[i] is not r:
+        i += 1
+    reminders.pop(i)
+
+
+def _new_id(data: Dict[str, Any]) -> str:
+    """Generate an 8-character hex id not used by any reminder in data."""
+    index = _by_id(data)
+    while True:
+        reminder_id = os.urandom(4).hex()
+        if reminder_id not in index:
+            return reminder_id
+
+
+def _remove_reminder(data: Dict[str, Any], reminder_id: str) -> bool:
+    """Remove a reminder from data and the index. Returns False if not found."""
+    r = _by_id(data).pop(reminder_id, None)
+    if r is None:
+        return False
+    _fmt_cache.pop(reminder_id, None)
+    _next_ts_queue.pop(reminder_id, None)
+    # pop() at the bisected position keeps the list sorted and in place
+    _unlink_sorted(data, r)
+    return True
+
+
+def _apply_op(data: Dict[str, Any], op: Dict[str, Any]) -> None:
+    """Apply one logged operation. Replaying an op on its own checkpoint is idempotent."""
+    kind = op["op"]
+    if kind == "add":
+        reminder = op["reminder"]
+        _remove_reminder(data, reminder["id"])
+        _insert_sorted(data, reminder)
+        _by_id(data)[reminder["id"]] = reminder
+        _schedule(data, reminder)
+    elif kind == "del":
+        _remove_reminder(data, op["id"])
+    elif kind in ("toggle", "trig"):
+        r = _by_id(data).get(op["id"])
+        if r is not None:
+            fields = op["fields"]
+            if fields.get("trigger_ts", r["trigger_ts"]) != r["trigger_ts"]:
+                _unlink_sorted(data, r)
+                r.update(fields)
+                _insert_sorted(data, r)
+            else:
+                r.update(fields)
+            _schedule(data, r)
+
+
+def _replay_log(data: Dict[str, Any]) -> int:
+    """Apply the operations logged against this checkpoint. Returns the op count."""
+    try:
+        with open(LOG_FILE, "rb") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return 0
+
+    gen = data.get("log_gen")
+    count = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            op = _parse_json(line)
+        except ValueError:
+            continue  # Line torn by an interrupted append
+        # Left over from an earlier checkpoint whose log was not removed
+        if op.get("gen") != gen:
+            continue
+        _apply_op(data, op)
+        count += 1
+    return count
+
+
+def _file_version(path: Path) -> Optional[tuple]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _cache_key() -> tuple:
+    """Identify the current version of the data and log files."""
+    return (str(DATA_FILE), _file_version(DATA_FILE), _file_version(LOG_FILE))
+
+
+# Parsed reminder data shared by all callers in this process:
+# (cache key, data). Callers that mutate data must save or log it.
+_data_cache = None
+_log_ops = 0  # Operations in LOG_FILE since the last checkpoint
+
+# Group commit: inside reminders_txn() saves only mark the data dirty and
+# logged operations are buffered; they are written once when the
+# outermost block exits
+_in_txn = 0
+_dirty = False
+_pending_data = None
+_pending_ops = []
+
+# The caches, index, heap and txn state above are shared by every thread
+# (the GUI loads on a worker thread); public functions hold this lock
+_lock = threading.RLock()
+
+
+def _locked(func):
+    """Run func while holding the module lock."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _lock:
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _read_checkpoint() -> Dict[str, Any]:
+    """Parse DATA_FILE, or return empty data if it does not exist."""
+    try:
+        with open(DATA_FILE, "rb") as f:
+            buf = f.read()
+    except FileNotFoundError:
+        return _default_data()
+    if buf.startswith(b"\xef\xbb\xbf"):  # BOM written by some Windows tools
+        buf = buf[3:]
+    return _parse_json(buf)
+
+
+def _clear_log() -> None:
+    """Remove the log after a checkpoint, or truncate it if it cannot be removed."""
+    try:
+        LOG_FILE.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError:
+        # e.g. open in another process on Windows
+        try:
+            with open(LOG_FILE, "wb"):
+                pass
+        except OSError:
+            pass  # Its lines carry the old log_gen and are skipped on replay
+
 
 def _load_data() -> Dict[str, Any]:
-    """Load reminder data from JSON file."""
-    if not DATA_FILE.exists():
-        return {"reminders": [], "settings": {"default_sound": True}, "last_check": None}
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Load reminder data (checkpoint plus log), cached until the files change."""
+    global _data_cache, _log_ops
+    if _pending_data is not None:
+        return _pending_data
+
+    key = _cache_key()
+    cache = _data_cache
+    if cache is not None and cache[0] == key:
+        return cache[1]
+
+    data = _read_checkpoint()
+    _migrate(data)
+    # Files written before the list was kept sorted (or edited by hand)
+    data["reminders"].sort(key=lambda r: r["trigger_ts"])
+    _log_ops = _replay_log(data)
+
+    _data_cache = (key, data)
+    return data
+
+
+def _replace_file(src: Path, dst: Path) -> None:
+    """os.replace, retried while dst is briefly held open by another process."""
+    for attempt in range(REPLACE_ATTEMPTS):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == REPLACE_ATTEMPTS - 1:
+                raise
+            time.sleep(REPLACE_RETRY_DELAY)
 
 
 def _save_data(data: Dict[str, Any]) -> None:
-    """Save reminder data to JSON file."""
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
+    """Checkpoint reminder data to JSON file and clear the log (deferred inside reminders_txn())."""
+    global _data_cache, _dirty, _pending_data, _log_ops
+    if _in_txn:
+        _dirty = True
+        _pending_data = data
+        return
+    _data_cache = None
+    # New generation: ops still in the old log no longer apply to this file
+    old_gen = data.get("log_gen")
+    data["log_gen"] = os.urandom(4).hex()
+    buf = _dump_data(data)
+    # Write a temp file and rename it over the checkpoint, so readers never
+    # see a truncated or half-written file
+    # Per-process name: two processes checkpointing at once must not share it
+    tmp = DATA_FILE.with_name(f"{DATA_FILE.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb", buffering=0) as f:
+            f.write(buf)
+            os.fsync(f.fileno())
+        _replace_file(tmp, DATA_FILE)
+    except OSError:
+        # The old checkpoint and its log are still the current store
+        data["log_gen"] = old_gen
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+    # Everything in the log is part of the checkpoint now
+    _clear_log()
+    _log_ops = 0
+    # The written dict is what the file now holds; skip re-parsing it
+    _data_cache = (_cache_key(), data)
+    _write_next_trigger(data)
+
+
+def _try_save_data(data: Dict[str, Any]) -> bool:
+    """Checkpoint unless the data file is locked; the log keeps working meanwhile."""
+    try:
+        _save_data(data)
+    except PermissionError:
+        return False
+    return True
+
+
+def _write_ops(data: Dict[str, Any], ops: List[Dict[str, Any]]) -> None:
+    """Append operations to the log, checkpointing when it grows too large."""
+    global _data_cache, _log_ops
+    # Another process changed the files since we loaded
+    stale = _data_cache is None or _data_cache[1] is not data or _data_cache[0] != _cache_key()
+
+    if stale:
+        # Log against the checkpoint on disk, then checkpoint (if needed)
+        # from a reload that includes the other process's ops, not from data
+        gen = _read_checkpoint().get("log_gen")
+        with open(LOG_FILE, "ab") as f:
+            f.write(b"".join(_dump_op(op, gen) for op in ops))
+            size = f.tell()
+        _data_cache = None
+        fresh = _load_data()
+        if (_log_ops > LOG_MAX_OPS or size > LOG_MAX_BYTES) and _try_save_data(fresh):
+            return
+        # The sidecar must not drop reminders only the other process knows about
+        _write_next_trigger(fresh)
+        return
+
+    if _log_ops + len(ops) > LOG_MAX_OPS and _try_save_data(data):
+        return
+
+    with open(LOG_FILE, "ab") as f:
+        f.write(b"".join(_dump_op(op, data.get("log_gen")) for op in ops))
+        size = f.tell()
+    _log_ops += len(ops)
+
+    if size > LOG_MAX_BYTES and _try_save_data(data):
+        return
+
+    _data_cache = (_cache_key(), data)
+    _write_next_trigger(data)
+
+
+def _append_op(data: Dict[str, Any], op: Dict[str, Any]) -> None:
+    """Record a mutation already applied to data (buffered inside reminders_txn())."""
+    global _pending_data
+    if _in_txn:
+        _pending_ops.append(op)
+        _pending_data = data
+        return
+    _write_ops(data, [op])
+
+
+@contextmanager
+def reminders_txn():
+    """
+    Batch several mutations into one write.
 
+    Example:
+        with reminders_txn():
+            for rid in ids:
+                mark_triggered(rid)
+    """
+    global _in_txn, _dirty, _pending_data
+    with _lock:
+        _in_txn += 1
+        try:
+            yield
+        finally:
+            _in_txn -= 1
+            # Flush even on error so memory and disk do not diverge
+            if _in_txn == 0 and _pending_data is not None:
+                data = _pending_data
+                ops = list(_pending_ops)
+                dirty = _dirty
+                _dirty = False
+                _pending_data = None
+                _pending_ops.clear()
+                if dirty:
+                    _save_data(data)  # The checkpoint covers the buffered ops too
+                elif ops:
+                    _write_ops(data, ops)
+
+
+def _next_trigger_ts(data: Dict[str, Any], now_ts: int) -> Optional[int]:
+    """Earliest trigger time of an enabled reminder that can still become due."""
+    cutoff = now_ts - DUE_WINDOW
+    heap = _trigger_heap(data)
+    # Drop stale entries and reminders past their due window from the top
+    while heap and (heap[0][0] <= cutoff or _heap_entry_live(data, heap[0]) is None):
+        heapq.heappop(heap)
+    return heap[0][0] if heap else None
+
+
+def _write_next_trigger(data: Dict[str, Any]) -> None:
+    """Write the next trigger time to the sidecar file read by the checker."""
+    next_ts = _next_trigger_ts(data, int(time.time()))
+    next_trigger = datetime.fromtimestamp(next_ts).isoformat() if next_ts is not None else None
+    try:
+        with open(NEXT_TRIGGER_FILE, "w", encoding="utf-8") as f:
+            json.dump({"next_trigger": next_trigger}, f)
+    except OSError:
+        pass
+
+
+@_locked
+def seconds_until_due(max_wait: int = 60, now_ts: Optional[int] = None) -> int:
+    """Seconds until the earliest trigger time on the heap, capped at max_wait."""
+    if now_ts is None:
+        now_ts = int(time.time())
+    next_ts = _next_trigger_ts(_load_data(), now_ts)
+    if next_ts is None:
+        return max_wait
+    if next_ts <= now_ts:
+        # Still due until the checker marks it: look again at the next minute
+        return min(60 - now_ts % 60, max_wait)
+    return min(next_ts - now_ts, max_wait)
+
+
+@_locked
+def update_next_trigger_cache() -> None:
+    """Recompute the next-trigger sidecar file from the reminder store."""
+    _write_next_trigger(_load_data())
+
+
+@_locked
 def add_reminder(
     title: str,
     time_str: str,
@@ -66,9 +550,10 @@ def add_reminder(
         sound_duration: Sound duration in seconds (0 = full length)
 
     Returns:
-        The created reminder dict
+        A copy of the created reminder dict
     """
     data = _load_data()
+    now = _now()
 
     # Parse time
     hour, minute = map(int, time_str.split(":"))
@@ -78,17 +563,17 @@ def add_reminder(
         year, month, day = map(int, date_str.split("-"))
         trigger_date = datetime(year, month, day, hour, minute)
     else:
-        now = datetime.now()
         trigger_date = datetime(now.year, now.month, now.day, hour, minute)
         # If time has passed today, schedule for tomorrow (for one-time reminders)
         if trigger_date < now and repeat == REPEAT_NONE:
-            trigger_date += timedelta(days=1)
+            trigger_date += _td(days=1)
 
     reminder = {
-        "id": str(uuid.uuid4())[:8],
+        "id": _new_id(data),
         "title": title,
         "description": description,
-        "trigger_time": trigger_date.strftime("%Y-%m-%d %H:%M"),
+        "trigger_time": trigger_date.strftime(_FMT_MIN),
+        "trigger_ts": int(trigger_date.timestamp()),
         "priority": priority,
         "repeat": repeat,
         "repeat_interval": repeat_interval,
@@ -96,134 +581,221 @@ def add_reminder(
         "sound_file": sound_file,
         "sound_duration": sound_duration,
         "enabled": True,
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "last_triggered": None
+        "created_at": now.strftime(_FMT_SEC),
+        "last_triggered": None,
+        "last_triggered_ts": None
     }
 
-    data["reminders"].append(reminder)
-    _save_data(data)
+    _insert_sorted(data, reminder)
+    _by_id(data)[reminder["id"]] = reminder
+    _schedule(data, reminder)
+    _append_op(data, {"op": "add", "reminder": reminder})
 
-    return reminder
+    return dict(reminder)
 
 
+@_locked
 def list_reminders(include_disabled: bool = False) -> List[Dict[str, Any]]:
     """List all reminders."""
     data = _load_data()
     reminders = data["reminders"]
 
-    if not include_disabled:
-        reminders = [r for r in reminders if r.get("enabled", True)]
-
-    # Sort by trigger time
-    reminders.sort(key=lambda r: r["trigger_time"])
-    return reminders
+    # Already sorted by trigger time. Return copies: the loaded dicts are
+    # shared with the cache, index and heap, so callers must not edit them
+    if include_disabled:
+        return [dict(r) for r in reminders]
+    return [dict(r) for r in reminders if r.get("enabled", True)]
 
 
+@_locked
 def get_reminder(reminder_id: str) -> Optional[Dict[str, Any]]:
-    """Get a specific reminder by ID."""
-    data = _load_data()
-    for r in data["reminders"]:
-        if r["id"] == reminder_id:
-            return r
-    return None
+    """Get a specific reminder by ID (a copy)."""
+    r = _by_id(_load_data()).get(reminder_id)
+    return dict(r) if r is not None else None
 
 
+@_locked
 def delete_reminder(reminder_id: str) -> bool:
     """Delete a reminder by ID."""
     data = _load_data()
-    original_len = len(data["reminders"])
-    data["reminders"] = [r for r in data["reminders"] if r["id"] != reminder_id]
-
-    if len(data["reminders"]) < original_len:
-        _save_data(data)
+    if _remove_reminder(data, reminder_id):
+        _append_op(data, {"op": "del", "id": reminder_id})
         return True
     return False
 
 
+@_locked
 def toggle_reminder(reminder_id: str) -> Optional[bool]:
     """Toggle a reminder's enabled state. Returns new state or None if not found."""
     data = _load_data()
-    for r in data["reminders"]:
-        if r["id"] == reminder_id:
-            r["enabled"] = not r.get("enabled", True)
-            _save_data(data)
-            return r["enabled"]
-    return None
-
-
-def get_due_reminders() -> List[Dict[str, Any]]:
-    """Get all reminders that are due (trigger time has passed)."""
+    r = _by_id(data).get(reminder_id)
+    if r is None:
+        return None
+    r["enabled"] = not r.get("enabled", True)
+    _schedule(data, r)
+    _append_op(data, {"op": "toggle", "id": reminder_id, "fields": {"enabled": r["enabled"]}})
+    return r["enabled"]
+
+
+@_locked
+def get_due_reminders(now_ts: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Get all reminders that are due (trigger time has passed) at now_ts (default: now)."""
     data = _load_data()
-    now = datetime.now()
+    if now_ts is None:
+        now_ts = int(time.time())
+    lo = now_ts - DUE_WINDOW
+    last_cut = now_ts - 60  # Skip reminders triggered within the last minute
+    heap = _trigger_heap(data)
     due = []
+    keep = []
+    seen = set()
+
+    # Only entries whose trigger time has passed are popped: O(k log N)
+    while heap and heap[0][0] <= now_ts:
+        entry = heapq.heappop(heap)
+        r = _heap_entry_live(data, entry)
+        if r is None or entry[1] in seen:
+            continue
+        seen.add(entry[1])
 
-    for r in data["reminders"]:
-        if not r.get("enabled", True):
+        # Check if due (within the last 5 minutes to avoid missing reminders).
+        # Older entries are dropped; changing the reminder pushes a new one.
+        if entry[0] <= lo:
             continue
+        # Still due until mark_triggered moves it on
+        keep.append(entry)
 
-        trigger_time = datetime.strptime(r["trigger_time"], "%Y-%m-%d %H:%M")
+        # Check if already triggered recently
+        if (r.get("last_triggered_ts") or 0) <= last_cut:
+            due.append(dict(r))
 
-        # Check if due (within the last 5 minutes to avoid missing reminders)
-        if trigger_time <= now and trigger_time > now - timedelta(minutes=5):
-            # Check if already triggered recently
-            if r.get("last_triggered"):
-                last = datetime.strptime(r["last_triggered"], "%Y-%m-%d %H:%M:%S")
-                if (now - last).total_seconds() < 60:  # Triggered within last minute
-                    continue
-            due.append(r)
+    for entry in keep:
+        heapq.heappush(heap, entry)
 
     return due
 
 
-def mark_triggered(reminder_id: str) -> None:
-    """Mark a reminder as triggered and update next trigger time if repeating."""
-    data = _load_data()
-    now = datetime.now()
+def _next_repeat_ts(repeat: str, interval: int, current_ts: int) -> int:
+    """Trigger time that follows current_ts for a repeating reminder."""
+    if repeat == REPEAT_DAILY:
+        return _add_days(current_ts, 1)
+    elif repeat == REPEAT_WEEKLY:
+        return _add_days(current_ts, 7)
+    elif repeat == REPEAT_WEEKDAYS:
+        # Skip to next weekday
+        return _add_days(current_ts, _WEEKDAY_SKIP[time.localtime(current_ts).tm_wday])
+    elif repeat == REPEAT_CUSTOM:
+        return _add_days(current_ts, interval)
+    return _add_days(current_ts, 1)
 
-    for r in data["reminders"]:
-        if r["id"] == reminder_id:
-            r["last_triggered"] = now.strftime("%Y-%m-%d %H:%M:%S")
-
-            # Calculate next trigger time for repeating reminders
-            if r["repeat"] != REPEAT_NONE:
-                current_trigger = datetime.strptime(r["trigger_time"], "%Y-%m-%d %H:%M")
-
-                if r["repeat"] == REPEAT_DAILY:
-                    next_trigger = current_trigger + timedelta(days=1)
-                elif r["repeat"] == REPEAT_WEEKLY:
-                    next_trigger = current_trigger + timedelta(weeks=1)
-                elif r["repeat"] == REPEAT_WEEKDAYS:
-                    # Skip to next weekday
-                    next_trigger = current_trigger + timedelta(days=1)
-                    while next_trigger.weekday() >= 5:  # Saturday=5, Sunday=6
-                        next_trigger += timedelta(days=1)
-                elif r["repeat"] == REPEAT_CUSTOM:
-                    interval = r.get("repeat_interval", 1)
-                    next_trigger = current_trigger + timedelta(days=interval)
-                else:
-                    next_trigger = current_trigger + timedelta(days=1)
-
-                r["trigger_time"] = next_trigger.strftime("%Y-%m-%d %H:%M")
-            else:
-                # One-time reminder: disable after triggering
-                r["enabled"] = False
 
-            break
+# Trigger times precomputed per repeating reminder at a time
+NEXT_TS_BATCH = 16
+
+# id -> ((trigger_ts, repeat, interval), upcoming trigger times) for
+# repeating reminders. Like _fmt_cache, kept out of the stored dicts.
+_next_ts_queue = {}
 
-    _save_data(data)
 
+def _pop_next_ts(r: Dict[str, Any]) -> int:
+    """Next trigger time of a repeating reminder, precomputed in batches."""
+    interval = r.get("repeat_interval", 1)
+    key = (r["trigger_ts"], r["repeat"], interval)
+    cached = _next_ts_queue.get(r["id"])
+    if cached is not None and cached[0] == key and cached[1]:
+        queue = cached[1]
+    else:
+        queue = deque()
+        ts = r["trigger_ts"]
+        for _ in range(NEXT_TS_BATCH):
+            ts = _next_repeat_ts(r["repeat"], interval, ts)
+            queue.append(ts)
+    next_ts = queue.popleft()
+    _next_ts_queue[r["id"]] = ((next_ts, r["repeat"], interval), queue)
+    return next_ts
+
+
+def _advance_reminder(r: Dict[str, Any], now_ts: int) -> None:
+    """Record a trigger on a reminder and move it to its next trigger time."""
+    r["last_triggered"] = time.strftime(_FMT_SEC, time.localtime(now_ts))
+    r["last_triggered_ts"] = now_ts
+
+    # Calculate next trigger time for repeating reminders
+    if r["repeat"] != REPEAT_NONE:
+        next_ts = _pop_next_ts(r)
+        r["trigger_ts"] = next_ts
+        r["trigger_time"] = _format_ts(next_ts)
+    else:
+        # One-time reminder: disable after triggering
+        r["enabled"] = False
 
+
+@_locked
+def mark_triggered(reminder_id: str, now_ts: Optional[int] = None) -> bool:
+    """Mark a reminder as triggered at now_ts (default: now) and update next trigger time if repeating."""
+    data = _load_data()
+    r = _by_id(data).get(reminder_id)
+    if r is None:
+        return False
+
+    _unlink_sorted(data, r)
+    _advance_reminder(r, int(time.time()) if now_ts is None else now_ts)
+    _insert_sorted(data, r)
+    _schedule(data, r)
+    _append_op(data, {"op": "trig", "id": reminder_id, "fields": {
+        "last_triggered": r["last_triggered"],
+        "last_triggered_ts": r["last_triggered_ts"],
+        "trigger_ts": r["trigger_ts"],
+        "trigger_time": r["trigger_time"],
+        "enabled": r.get("enabled", True)
+    }})
+    return True
+
+
+@_locked
+def mark_triggered_many(reminder_ids: List[str], now_ts: Optional[int] = None) -> int:
+    """
+    Mark several reminders as triggered with a single save.
+
+    Args:
+        reminder_ids: IDs of the reminders to mark
+        now_ts: Trigger time in unix seconds (default: now)
+
+    Returns:
+        Number of reminders that were found and updated
+    """
+    if now_ts is None:
+        now_ts = int(time.time())
+    with reminders_txn():
+        return sum(mark_triggered(rid, now_ts) for rid in reminder_ids)
+
+
+@_locked
 def clear_all_reminders() -> int:
     """Clear all reminders. Returns count of deleted reminders."""
     data = _load_data()
     count = len(data["reminders"])
     data["reminders"] = []
-    _save_data(data)
+    _by_id(data).clear()
+    _fmt_cache.clear()
+    _next_ts_queue.clear()
+    _save_data(data)  # Checkpoint: nothing in the log is still needed
     return count
 
 
+# id -> (display fields, formatted line). Kept out of the reminder dicts
+# so it is never written to the data file or the log.
+_fmt_cache = {}
+
+
 def format_reminder(r: Dict[str, Any]) -> str:
-    """Format a reminder for display."""
+    """Format a reminder for display (memoized until its displayed fields change)."""
+    key = (r.get("enabled", True), r["trigger_time"], r["priority"], r["repeat"],
+           r.get("repeat_interval", 1), r["title"])
+    cached = _fmt_cache.get(r["id"])
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
     status = "[ON]" if r.get("enabled", True) else "[OFF]"
     priority = "[!]" if r["priority"] == "important" else ""
     repeat_str = ""
@@ -236,7 +808,9 @@ def format_reminder(r: Dict[str, Any]) -> str:
         }
         repeat_str = f" ({repeat_map.get(r['repeat'], r['repeat'])})"
 
-    return f"{status} {r['id']} | {r['trigger_time']} | {priority}{r['title']}{repeat_str}"
+    line = f"{status} {r['id']} | {r['trigger_time']} | {priority}{r['title']}{repeat_str}"
+    _fmt_cache[r["id"]] = (key, line)
+    return line
 
 
 # CLI interface
@@ -268,6 +842,11 @@ Commands:
   check
       Check and display due reminders (used by scheduler)
 
+  daemon
+      Stay running and display reminders as they come due (Ctrl+C to stop).
+      Like check, it does not mark them triggered, so the background
+      checker still shows its notifications
+
 Examples:
   python reminder_manager.py add "Take a break" 15:00
   python reminder_manager.py add "Weekly meeting" 10:00 2025-12-20 --repeat weekly
@@ -352,6 +931,25 @@ Examples:
         else:
             print("No due reminders.")
 
+    elif cmd == "daemon":
+        # The data stays loaded between checks; each check only stats the
+        # files, so external edits are picked up within max_wait seconds.
+        # Nothing is marked triggered (that is reminder_checker's job), so
+        # remember what was printed until it leaves the due window.
+        shown = set()
+        try:
+            while True:
+                now_ts = int(time.time())
+                for r in get_due_reminders(now_ts):
+                    key = (r["id"], r["trigger_ts"])
+                    if key not in shown:
+                        shown.add(key)
+                        print(format_reminder(r))
+                shown = {key for key in shown if key[1] > now_ts - DUE_WINDOW}
+                time.sleep(seconds_until_due())
+        except KeyboardInterrupt:
+            pass
+
     elif cmd == "help" or cmd == "--help" or cmd == "-h":
         print_help()
 